@@ -1,8 +1,11 @@
 import os
 import pickle
+import shelve
+import sys
 import datetime
+import functools
+import io
 import math
-import matplotlib.pyplot as plt
 
 # ---------------------------------------------------------
 #  CONSTANTES Y CONFIGURACION GLOBAL
@@ -21,6 +24,45 @@ SIMBOLO_MONEDA = {
 # Moneda por defecto
 moneda_actual = "COP"
 
+# Costo de construccion por m2 segun estrato (valor medio de cada rango, COP).
+# Estratos 1 y 2 no tienen rango propio y usan el del estrato 6.
+COSTO_M2_POR_ESTRATO = {
+    3: 2_050_000.0,   # (1.800.000 + 2.300.000) / 2
+    4: 2_550_000.0,   # (2.300.000 + 2.800.000) / 2
+    5: 3_200_000.0,   # (2.800.000 + 3.600.000) / 2
+    6: 4_050_000.0    # (3.600.000 + 4.500.000) / 2
+}
+# Porcentaje fijo del lote que se construye segun tamano
+PORC_CONSTRUCCION_POR_TAMANO = {
+    "grande": 80.0,
+    "mediana": 60.0,
+    "chica": 45.0
+}
+# Penalizacion (COP) por cada unidad extra en el modelo de ingreso
+PENALIZACION_POR_TIPO = {
+    "casas": 50000.0,
+    "edificio": 80000.0
+}
+# Zonas sociales en funcion del estrato
+ZONAS_SOCIALES_POR_ESTRATO = {
+    1: ("Zonas verdes", "Parque infantil"),
+    2: ("Zonas verdes", "Parque infantil"),
+    3: ("Parque infantil", "Salon comun"),
+    4: ("Piscina", "Salon comun"),
+    5: ("Piscina", "Sauna", "Gimnasio"),
+    6: ("Piscina", "Sauna", "Gimnasio")
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _formatear_en_moneda(valor_cop, moneda):
+    """
+    Formatea valor_cop en la moneda indicada. Se cachea porque los mismos
+    montos se formatean en cada recibo y en cada consulta del proyecto.
+    """
+    convertido = valor_cop * TASA_DE_CONVERSION[moneda]
+    return f"{SIMBOLO_MONEDA[moneda]} {convertido:,.2f} {moneda}"
+
 
 def formatear_valor(valor_cop):
     """
@@ -28,16 +70,105 @@ def formatear_valor(valor_cop):
     un string con simbolo y codigo. Ejemplo:
     si valor_cop = 10000 y moneda_actual = "USD", retorna "$ 2.50 USD"
     """
-    factor = TASA_DE_CONVERSION.get(moneda_actual, 1.0)
-    convertido = valor_cop * factor
-    simbolo = SIMBOLO_MONEDA.get(moneda_actual, "$")
-    return f"{simbolo} {convertido:,.2f} {moneda_actual}"
+    return _formatear_en_moneda(valor_cop, moneda_actual)
+
+
+# ---------------------------------------------------------
+#  FUNCIONES DE CALCULO (solo reciben y retornan numeros)
+# ---------------------------------------------------------
+def _calcular_costos(area_lote, precio_terreno_m2, porc_construccion, costo_m2):
+    """
+    Calcula areas, costos y precios del proyecto (valores en COP).
+    Retorna la tupla (area_construida, area_no_construida, costo_terreno_total,
+    costo_construccion_total, presupuesto_total, ganancia, precio_venta_m2,
+    precio_venta_total).
+    """
+    # 1) Area construida y area no construida (resto)
+    area_construida = area_lote * (porc_construccion / 100.0)
+    area_no_construida = area_lote - area_construida
+
+    # 2) Costo de terreno total
+    costo_terreno_total = area_lote * precio_terreno_m2
+
+    # 3) Costo de construccion total
+    costo_construccion_total = area_construida * costo_m2
+
+    # 4) Presupuesto total (terreno + construccion)
+    presupuesto_total = costo_terreno_total + costo_construccion_total
+
+    # 5) Ganancia deseada: 20% sobre presupuesto
+    ganancia = presupuesto_total * 0.20
+
+    # 6) Precio de venta por m2 (derivado sin penalizacion)
+    if area_construida > 0:
+        # Multiplicamos por 1.20 porque la ganancia es del 20%
+        precio_venta_m2 = (1.20 * presupuesto_total) / area_construida
+    else:
+        precio_venta_m2 = 0.0
+
+    # 7) Precio de venta total
+    precio_venta_total = area_construida * precio_venta_m2
+
+    return (area_construida, area_no_construida, costo_terreno_total,
+            costo_construccion_total, presupuesto_total, ganancia,
+            precio_venta_m2, precio_venta_total)
+
+
+def _unidades_optimas(precio_base_m2, beta, area_construida, area_min_vivienda):
+    """
+    Numero de unidades que maximiza el ingreso con penalizacion beta (COP)
+    por cada unidad extra, sin superar la capacidad del area construida.
+    """
+    # Modelo de ingreso R(n) = n * area_min_vivienda * (precio_base_m2 - beta * n)
+    # Para maximizar R, igualamos derivada a cero:
+    #   dR/dn = area_min_vivienda * (precio_base_m2 - 2 * beta * n) = 0
+    #   => precio_base_m2 - 2*beta*n = 0
+    #   => n_opt = precio_base_m2 / (2 * beta)
+    n_opt = precio_base_m2 / (2.0 * beta)
+    n_opt = max(1, math.floor(n_opt))  # por lo menos 1 unidad
+
+    # No superar la capacidad de area disponible
+    capacidad_area = math.floor(area_construida / area_min_vivienda)
+    if n_opt > capacidad_area:
+        n_opt = capacidad_area
+    return n_opt
+
+
+def _area_min_vivienda(tipo, tamano, habitaciones):
+    """
+    Retorna el area minima (m2) de cada unidad segun tipo de proyecto,
+    tamano de construccion y habitaciones por unidad.
+    """
+    if tipo == "casas":
+        if tamano == "grande":
+            # Casas grandes: 30 m2 por habitacion + 40 m2 sala-comedor
+            return habitaciones * 30.0 + 40.0
+        if tamano == "mediana":
+            # Casas medianas: 25 m2 por habitacion + 35 m2 sala-comedor
+            return habitaciones * 25.0 + 35.0
+        # Casas chiquas: area minima fija de 60 m2
+        return 60.0
+    if tipo == "edificio":
+        # Apartamentos: 20 m2 por habitacion + 30 m2 sala-comedor
+        return habitaciones * 20.0 + 30.0
+    # Tipo "otro": m2 minimo por bodega
+    return 100.0
 
 
 # ---------------------------------------------------------
 #  CLASE PRINCIPAL: Proyecto
 # ---------------------------------------------------------
 class Proyecto:
+    __slots__ = (
+        "pid", "tipo", "fecha_inicio", "direccion", "area_lote", "precio_terreno_m2",
+        "tamano", "estrato", "habitaciones", "fecha_estimada_final", "_zonas_sociales",
+        "_zonas_joined", "porc_construccion", "finalizado", "fecha_real_final",
+        "area_construida", "area_no_construida", "area_min_vivienda", "num_viviendas",
+        "aptos_por_torre", "num_torres", "area_bodegas", "costo_terreno_total",
+        "costo_construccion_m2", "costo_construccion_total", "presupuesto_total",
+        "ganancia", "precio_venta_m2", "precio_venta_total", "valor_casa"
+    )
+
     def __init__(
         self,
         pid,
@@ -65,22 +196,10 @@ class Proyecto:
         self.fecha_estimada_final = fecha_estimada_final
 
         # Zonas sociales en funcion del estrato
-        if estrato >= 5:
-            self.zonas_sociales = ["Piscina", "Sauna", "Gimnasio"]
-        elif estrato == 4:
-            self.zonas_sociales = ["Piscina", "Salon comun"]
-        elif estrato == 3:
-            self.zonas_sociales = ["Parque infantil", "Salon comun"]
-        else:
-            self.zonas_sociales = ["Zonas verdes", "Parque infantil"]
+        self.zonas_sociales = ZONAS_SOCIALES_POR_ESTRATO[estrato]
 
         # Porcentaje fijo de construccion segun tamano
-        if tamano == "grande":
-            self.porc_construccion = 80.0
-        elif tamano == "mediana":
-            self.porc_construccion = 60.0
-        else:  # "chica"
-            self.porc_construccion = 45.0
+        self.porc_construccion = PORC_CONSTRUCCION_POR_TAMANO.get(tamano, 45.0)
 
         # Indicadores de estado de finalizacion
         self.finalizado = False
@@ -89,151 +208,94 @@ class Proyecto:
         # Calcular todos los valores derivados
         self._recalcular()
 
-    def _recalcular(self):
+    @property
+    def zonas_sociales(self):
         """
-        Recalcula todos los atributos de area, costo, ganancia, precio, etc.
-        Tambien aplica derivada para optimizar numero de unidades.
+        Zonas sociales del proyecto (depende del estrato), como tupla
+        inmutable para que zonas_joined no quede desactualizado.
         """
+        return self._zonas_sociales
 
-        # 1) Area construida y area no construida (resto)
-        self.area_construida = self.area_lote * (self.porc_construccion / 100.0)
-        self.area_no_construida = self.area_lote - self.area_construida
+    @zonas_sociales.setter
+    def zonas_sociales(self, zonas):
+        # El texto "zona1, zona2, ..." se arma una vez por asignacion y no en
+        # cada recibo o consulta
+        self._zonas_sociales = tuple(zonas)
+        self._zonas_joined = ", ".join(self._zonas_sociales)
 
-        # 2) Calculo de area minima por unidad y numero de unidades segun tipo
-        if self.tipo == "casas":
-            # AREA MINIMA POR CASA segun tamano
-            if self.tamano == "grande":
-                # Casas grandes: 30 m2 por habitacion + 40 m2 sala-comedor
-                self.area_min_vivienda = self.habitaciones * 30.0 + 40.0
-            elif self.tamano == "mediana":
-                # Casas medianas: 25 m2 por habitacion + 35 m2 sala-comedor
-                self.area_min_vivienda = self.habitaciones * 25.0 + 35.0
-            else:
-                # Casas chiquas: area minima fija de 60 m2
-                self.area_min_vivienda = 60.0
-
-            # 2.1) Calculo costo terreno y construccion para hallar precio_base_m2
-            costo_terreno = self.area_lote * self.precio_terreno_m2
-            # Costo de construccion por m2 segun estrato (valores medios)
-            if self.estrato == 3:
-                costo_m2 = (1800000 + 2300000) / 2
-            elif self.estrato == 4:
-                costo_m2 = (2300000 + 2800000) / 2
-            elif self.estrato == 5:
-                costo_m2 = (2800000 + 3600000) / 2
-            else:  # estrato 6 o mayor
-                costo_m2 = (3600000 + 4500000) / 2
-
-            costo_construccion = self.area_construida * costo_m2
-            presupuesto_sin_ganancia = costo_terreno + costo_construccion
-
-            # precio_base_m2 es el precio de venta sin contar penalizacion
-            if self.area_construida > 0:
-                # Multiplicamos por 1.20 porque la ganancia es del 20%
-                precio_base_m2 = (1.20 * presupuesto_sin_ganancia) / self.area_construida
-            else:
-                precio_base_m2 = 0.0
-
-            # 2.2) Definimos beta (penalizacion por cada casa extra)
-            beta_casas = 50000.0  # COP de penalizacion
-
-            # 2.3) Modelo de ingreso R(n) = n * area_min_vivienda * (precio_base_m2 - beta_casas * n)
-            # Para maximizar R, igualamos derivada a cero:
-            #   dR/dn = area_min_vivienda * (precio_base_m2 - 2 * beta_casas * n) = 0
-            #   => precio_base_m2 - 2*beta_casas*n = 0
-            #   => n_opt = precio_base_m2 / (2 * beta_casas)
-            n_opt = precio_base_m2 / (2.0 * beta_casas)
-            n_opt = max(1, math.floor(n_opt))  # por lo menos 1 unidad
-
-            # 2.4) No superar la capacidad de area disponible
-            capacidad_area = math.floor(self.area_construida / self.area_min_vivienda)
-            if n_opt > capacidad_area:
-                n_opt = capacidad_area
-
-            self.num_viviendas = n_opt
-
-        elif self.tipo == "edificio":
-            # AREA MINIMA POR APARTAMENTO: 20 m2 por habitacion + 30 m2 sala-comedor
-            self.area_min_vivienda = self.habitaciones * 20.0 + 30.0
-
-            # 2.1) Calculo costo terreno y construccion
-            costo_terreno = self.area_lote * self.precio_terreno_m2
-            if self.estrato == 3:
-                costo_m2 = (1800000 + 2300000) / 2
-            elif self.estrato == 4:
-                costo_m2 = (2300000 + 2800000) / 2
-            elif self.estrato == 5:
-                costo_m2 = (2800000 + 3600000) / 2
-            else:
-                costo_m2 = (3600000 + 4500000) / 2
-
-            costo_construccion = self.area_construida * costo_m2
-            presupuesto_sin_ganancia = costo_terreno + costo_construccion
-
-            if self.area_construida > 0:
-                precio_base_m2 = (1.20 * presupuesto_sin_ganancia) / self.area_construida
-            else:
-                precio_base_m2 = 0.0
-
-            # 2.2) Definimos beta para edificios (penalizacion por cada apto extra)
-            beta_edificio = 80000.0  # COP de penalizacion
+    @property
+    def zonas_joined(self):
+        """
+        Zonas sociales separadas por coma, listas para mostrar.
+        """
+        return self._zonas_joined
 
-            # 2.3) Igualamos derivada a cero:
-            #   dR/dn = area_min_vivienda * (precio_base_m2 - 2 * beta_edificio * n) = 0
-            n_opt = precio_base_m2 / (2.0 * beta_edificio)
-            n_opt = max(1, math.floor(n_opt))
+    def __setstate__(self, estado):
+        """
+        Restaura un proyecto desde pickle. Los proyectos guardados antes de
+        usar __slots__ traen su estado como diccionario; los actuales como
+        la tupla (None, {atributo: valor}).
+        """
+        if isinstance(estado, tuple):
+            estado = estado[1]
+        for nombre, valor in estado.items():
+            setattr(self, nombre, valor)
 
-            # 2.4) No superar la capacidad de area
-            capacidad_area = math.floor(self.area_construida / self.area_min_vivienda)
-            if n_opt > capacidad_area:
-                n_opt = capacidad_area
+    def _recalcular(self):
+        """
+        Recalcula todos los atributos de area, costo, ganancia, precio, etc.
+        Tambien aplica derivada para optimizar numero de unidades.
+        """
+        self._recalcular_costos()
+        self._recalcular_unidades()
 
-            self.num_viviendas = n_opt
+    def _recalcular_costos(self):
+        """
+        Recalcula areas, costos, ganancia y precios de venta. Depende de
+        area_lote, precio_terreno_m2, porc_construccion y estrato.
+        Como el numero de unidades depende del precio de venta, despues
+        debe llamarse _recalcular_unidades.
+        """
+        # Costo de construccion por m2 segun estrato (valores medios)
+        self.costo_construccion_m2 = COSTO_M2_POR_ESTRATO.get(self.estrato, 4_050_000.0)
+
+        # 1) Areas, costos, ganancia y precios de venta
+        (self.area_construida, self.area_no_construida, self.costo_terreno_total,
+         self.costo_construccion_total, self.presupuesto_total, self.ganancia,
+         self.precio_venta_m2, self.precio_venta_total) = _calcular_costos(
+            self.area_lote, self.precio_terreno_m2, self.porc_construccion,
+            self.costo_construccion_m2
+        )
+
+    def _recalcular_unidades(self):
+        """
+        Recalcula area minima, numero de unidades y valor por unidad a partir
+        de los costos ya calculados (basta si solo cambian las habitaciones).
+        """
+        # 2) Area minima por unidad y numero de unidades segun tipo
+        self.area_min_vivienda = _area_min_vivienda(self.tipo, self.tamano, self.habitaciones)
+
+        beta = PENALIZACION_POR_TIPO.get(self.tipo)
+        if beta is not None:
+            # Casas y edificios: numero optimo segun la penalizacion beta;
+            # precio_base_m2 (sin penalizacion) es el precio de venta por m2
+            self.num_viviendas = _unidades_optimas(
+                self.precio_venta_m2, beta, self.area_construida, self.area_min_vivienda
+            )
 
-            # 2.5) Distribuir en torres y aptos por torre fijos
-            aptos_por_torre = 10
-            num_torres = math.ceil(self.num_viviendas / aptos_por_torre)
-            self.aptos_por_torre = min(aptos_por_torre, self.num_viviendas)
-            self.num_torres = num_torres
+            if self.tipo == "edificio":
+                # 2.1) Distribuir en torres y aptos por torre fijos
+                aptos_por_torre = 10
+                num_torres = math.ceil(self.num_viviendas / aptos_por_torre)
+                self.aptos_por_torre = min(aptos_por_torre, self.num_viviendas)
+                self.num_torres = num_torres
 
         else:
             # Para tipo "otro", usamos 70% del lote en bodegas
             self.area_bodegas = self.area_lote * 0.70
-            self.area_min_vivienda = 100.0  # m2 minimo por bodega
             self.num_viviendas = max(1, math.floor(self.area_bodegas / self.area_min_vivienda))
 
-        # 3) Costo de terreno total (COP)
-        self.costo_terreno_total = self.area_lote * self.precio_terreno_m2
-
-        # 4) Costo construccion m2 segun estrato (valores medios)
-        if self.estrato == 3:
-            self.costo_construccion_m2 = (1800000 + 2300000) / 2
-        elif self.estrato == 4:
-            self.costo_construccion_m2 = (2300000 + 2800000) / 2
-        elif self.estrato == 5:
-            self.costo_construccion_m2 = (2800000 + 3600000) / 2
-        else:
-            self.costo_construccion_m2 = (3600000 + 4500000) / 2
-
-        # 5) Costo de construccion total (COP)
-        self.costo_construccion_total = self.area_construida * self.costo_construccion_m2
-
-        # 6) Presupuesto total (terreno + construccion)
-        self.presupuesto_total = self.costo_terreno_total + self.costo_construccion_total
-
-        # 7) Ganancia deseada: 20% sobre presupuesto
-        self.ganancia = self.presupuesto_total * 0.20
-
-        # 8) Precio de venta por m2 (derivado sin penalizacion)
-        if self.area_construida > 0:
-            self.precio_venta_m2 = (1.20 * self.presupuesto_total) / self.area_construida
-        else:
-            self.precio_venta_m2 = 0.0
-
-        # 9) Precio de venta total
-        self.precio_venta_total = self.area_construida * self.precio_venta_m2
-
-        # 10) Valor de cada unidad (en COP)
+        # 3) Valor de cada unidad (en COP)
         if self.num_viviendas > 0:
             self.valor_casa = self.precio_venta_total / self.num_viviendas
         else:
@@ -245,11 +307,8 @@ class Proyecto:
         Se asume: valor_unidad = area_min_vivienda * (precio_base_m2 - beta * n)
         => derivada respecto a n: -beta * area_min_vivienda
         """
-        if self.tipo == "casas":
-            beta = 50000.0
-        elif self.tipo == "edificio":
-            beta = 80000.0
-        else:
+        beta = PENALIZACION_POR_TIPO.get(self.tipo)
+        if beta is None:
             return None
         return -beta * self.area_min_vivienda
 
@@ -261,39 +320,72 @@ class Proyecto:
 
 
 # ---------------------------------------------------------
-#  CLASE: BaseDeDatos para guardar proyectos con pickle
+#  CLASE: BaseDeDatos para guardar proyectos con shelve
 # ---------------------------------------------------------
+class _Unpickler(pickle.Unpickler):
+    """
+    Unpickler que busca en este modulo las clases guardadas como
+    __main__.X. Al ejecutar 'python Constructora.py' los proyectos se
+    guardan como __main__.Proyecto; un script que importa Constructora
+    no tendria esa clase en su propio __main__.
+    """
+
+    def find_class(self, module, name):
+        if module == "__main__" and name in globals():
+            module = __name__
+        return super().find_class(module, name)
+
+
+class _Estante(shelve.DbfilenameShelf):
+    """
+    Shelf que carga los proyectos con _Unpickler (sin writeback).
+    """
+
+    def __getitem__(self, key):
+        return _Unpickler(io.BytesIO(self.dict[key.encode(self.keyencoding)])).load()
+
+
 class BaseDeDatos:
-    def __init__(self, archivo="ProyectosGuardados.pkl"):
+    def __init__(self, archivo="ProyectosGuardados.db", archivo_pickle="ProyectosGuardados.pkl"):
         self.archivo = archivo
-        self.proyectos = self._cargar()
-
-    def _cargar(self):
-        """
-        Carga el diccionario de proyectos desde un archivo pickle si existe,
-        o devuelve un diccionario vacio en caso contrario.
-        """
-        if os.path.exists(self.archivo):
-            with open(self.archivo, "rb") as f:
-                try:
-                    return pickle.load(f)
-                except:
-                    return {}
-        return {}
+        # shelve guarda cada proyecto por separado (una entrada por pid),
+        # asi cada cambio solo escribe el proyecto afectado.
+        self.proyectos = _Estante(self.archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        self._migrar_pickle(archivo_pickle)
 
-    def _guardar(self):
+    def _migrar_pickle(self, archivo_pickle):
         """
-        Guarda el diccionario de proyectos en un archivo pickle.
+        Importa los proyectos guardados con la version anterior (un unico
+        archivo pickle con todo el diccionario) y elimina ese archivo para
+        no volver a importarlos. Las clases se resuelven con _Unpickler, asi
+        que tambien se importan desde un script que importa Constructora.
+        Si el archivo no se puede leer (corrupto o con clases que ya no
+        existen) no se borra: se renombra a '.bak' para que el usuario pueda
+        recuperarlo y se avisa el motivo.
         """
-        with open(self.archivo, "wb") as f:
-            pickle.dump(self.proyectos, f)
+        try:
+            with open(archivo_pickle, "rb", buffering=1 << 20) as f:
+                antiguos = _Unpickler(f).load()
+        except FileNotFoundError:
+            return
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+            respaldo = archivo_pickle + ".bak"
+            os.replace(archivo_pickle, respaldo)
+            print(f"  Aviso: no se pudo leer '{archivo_pickle}' ({type(e).__name__}: {e}); "
+                  f"se guardo una copia en '{respaldo}'.")
+            return
+        for pid, proyecto in antiguos.items():
+            self.proyectos[pid] = proyecto
+        self.proyectos.sync()
+        # Solo se borra cuando todos los proyectos ya estan en la base nueva
+        os.remove(archivo_pickle)
 
     def agregar(self, proyecto):
         """
         Agrega o actualiza un proyecto en la base de datos y guarda en disco.
         """
         self.proyectos[proyecto.pid] = proyecto
-        self._guardar()
+        self.proyectos.sync()
 
     def eliminar(self, pid):
         """
@@ -301,7 +393,7 @@ class BaseDeDatos:
         """
         if pid in self.proyectos:
             del self.proyectos[pid]
-            self._guardar()
+            self.proyectos.sync()
 
     def obtener(self, pid):
         """
@@ -309,12 +401,30 @@ class BaseDeDatos:
         """
         return self.proyectos.get(pid)
 
+    def __len__(self):
+        """
+        Retorna la cantidad de proyectos guardados.
+        """
+        return len(self.proyectos)
+
+    def __contains__(self, pid):
+        """
+        Indica si existe un proyecto con ID pid, sin cargarlo del disco.
+        """
+        return pid in self.proyectos
+
     def listar(self):
         """
         Retorna una lista con todos los proyectos guardados.
         """
         return list(self.proyectos.values())
 
+    def cerrar(self):
+        """
+        Cierra el archivo de la base de datos.
+        """
+        self.proyectos.close()
+
 
 # ---------------------------------------------------------
 #  FUNCIONES AUXILIARES DE ARCHIVOS Y RECIBOS
@@ -327,61 +437,69 @@ def crear_carpetas():
     os.makedirs("ProyectosFinalizados", exist_ok=True)
 
 
+_ENCABEZADO_RECIBO = (
+    "===========================================\n"
+    "             RECIBO DE PROYECTO            \n"
+    "===========================================\n\n"
+)
+
+
 def generar_recibo(proy):
     """
     Genera un archivo de texto en 'Proyectos/{pid}.txt' con los datos del proyecto,
     usando la moneda actual para formatear valores.
     """
     ruta = os.path.join("Proyectos", f"{proy.pid}.txt")
+    # Se arma todo el texto en memoria y se escribe de una sola vez
+    partes = [_ENCABEZADO_RECIBO]
+
+    partes.append("1. DATOS GENERALES\n")
+    partes.append(f"   ID                         : {proy.pid}\n")
+    partes.append(f"   Tipo de Proyecto           : {proy.tipo.capitalize()}\n")
+    partes.append(f"   Fecha de Inicio            : {proy.fecha_inicio}\n")
+    partes.append(f"   Direccion                  : {proy.direccion}\n\n")
+
+    partes.append("2. AREAS Y TERRENO\n")
+    partes.append(f"   Area total del lote         : {proy.area_lote:,.2f} m2\n")
+    partes.append(f"   Precio terreno por m2       : {formatear_valor(proy.precio_terreno_m2)} /m2\n")
+    partes.append(f"   Costo terreno total         : {formatear_valor(proy.costo_terreno_total)}\n")
+    partes.append(f"   % Area construida           : {proy.porc_construccion:.0f} %\n")
+    partes.append(f"   Area construida             : {proy.area_construida:,.2f} m2\n")
+    partes.append(f"   Area no construida          : {proy.area_no_construida:,.2f} m2\n\n")
+
+    partes.append("3. RESTRICCIONES Y VIVIENDAS\n")
+    if proy.tipo == "edificio":
+        partes.append(f"   Numero de torres            : {proy.num_torres}\n")
+        partes.append(f"   Aptos por torre             : {proy.aptos_por_torre}\n")
+    partes.append(f"   Habitaciones por unidad     : {proy.habitaciones}\n")
+    partes.append(f"   Area minima por unidad      : {proy.area_min_vivienda:,.2f} m2\n")
+    partes.append(f"   Numero de unidades estimado : {proy.num_viviendas:,d}\n")
+    partes.append(f"   Valor por unidad            : {formatear_valor(proy.valor_casa)}\n\n")
+
+    partes.append("4. COSTOS Y GANANCIAS\n")
+    partes.append(f"   Costo construccion por m2          : {formatear_valor(proy.costo_construccion_m2)} /m2\n")
+    partes.append(f"   Costo construccion total           : {formatear_valor(proy.costo_construccion_total)}\n")
+    partes.append(f"   Presupuesto (terreno+construccion) : {formatear_valor(proy.presupuesto_total)}\n")
+    partes.append(f"   Ganancia (20%)                     : {formatear_valor(proy.ganancia)}\n")
+    partes.append(f"   Precio venta por m2 (derivado)     : {formatear_valor(proy.precio_venta_m2)} /m2\n")
+    partes.append(f"   Precio venta total                 : {formatear_valor(proy.precio_venta_total)}\n\n")
+
+    if proy.tipo in ["casas", "edificio"]:
+        derivada = proy.calcular_derivada_valor_por_vivienda()
+        if derivada is not None:
+            partes.append(f"   Derivada valor por unidad respecto num unidades: {derivada:,.2f}\n\n")
+
+    partes.append("5. ZONAS SOCIALES\n")
+    partes.append(f"   {proy.zonas_joined}\n\n")
+
+    partes.append("6. FECHAS DE FINALIZACION\n")
+    partes.append(f"   Fecha estimada de finalizacion : {proy.fecha_estimada_final}\n")
+    if proy.finalizado:
+        partes.append(f"   Fecha real de finalizacion     : {proy.fecha_real_final}\n")
+    partes.append("\n===========================================\n")
+
     with open(ruta, "w", encoding="utf-8") as f:
-        f.write("===========================================\n")
-        f.write("             RECIBO DE PROYECTO            \n")
-        f.write("===========================================\n\n")
-
-        f.write("1. DATOS GENERALES\n")
-        f.write(f"   ID                         : {proy.pid}\n")
-        f.write(f"   Tipo de Proyecto           : {proy.tipo.capitalize()}\n")
-        f.write(f"   Fecha de Inicio            : {proy.fecha_inicio}\n")
-        f.write(f"   Direccion                  : {proy.direccion}\n\n")
-
-        f.write("2. AREAS Y TERRENO\n")
-        f.write(f"   Area total del lote         : {proy.area_lote:,.2f} m2\n")
-        f.write(f"   Precio terreno por m2       : {formatear_valor(proy.precio_terreno_m2)} /m2\n")
-        f.write(f"   Costo terreno total         : {formatear_valor(proy.costo_terreno_total)}\n")
-        f.write(f"   % Area construida           : {proy.porc_construccion:.0f} %\n")
-        f.write(f"   Area construida             : {proy.area_construida:,.2f} m2\n")
-        f.write(f"   Area no construida          : {proy.area_no_construida:,.2f} m2\n\n")
-
-        f.write("3. RESTRICCIONES Y VIVIENDAS\n")
-        if proy.tipo == "edificio":
-            f.write(f"   Numero de torres            : {proy.num_torres}\n")
-            f.write(f"   Aptos por torre             : {proy.aptos_por_torre}\n")
-        f.write(f"   Habitaciones por unidad     : {proy.habitaciones}\n")
-        f.write(f"   Area minima por unidad      : {proy.area_min_vivienda:,.2f} m2\n")
-        f.write(f"   Numero de unidades estimado : {proy.num_viviendas:,d}\n")
-        f.write(f"   Valor por unidad            : {formatear_valor(proy.valor_casa)}\n\n")
-
-        f.write("4. COSTOS Y GANANCIAS\n")
-        f.write(f"   Costo construccion por m2          : {formatear_valor(proy.costo_construccion_m2)} /m2\n")
-        f.write(f"   Costo construccion total           : {formatear_valor(proy.costo_construccion_total)}\n")
-        f.write(f"   Presupuesto (terreno+construccion) : {formatear_valor(proy.presupuesto_total)}\n")
-        f.write(f"   Ganancia (20%)                     : {formatear_valor(proy.ganancia)}\n")
-        f.write(f"   Precio venta por m2 (derivado)     : {formatear_valor(proy.precio_venta_m2)} /m2\n")
-        f.write(f"   Precio venta total                 : {formatear_valor(proy.precio_venta_total)}\n\n")
-
-        if proy.tipo in ["casas", "edificio"]:
-            derivada = proy.calcular_derivada_valor_por_vivienda()
-            if derivada is not None:
-                f.write(f"   Derivada valor por unidad respecto num unidades: {derivada:,.2f}\n\n")
-
-        f.write("5. ZONAS SOCIALES\n")
-        f.write(f"   {', '.join(proy.zonas_sociales)}\n\n")
-
-        f.write("6. FECHAS DE FINALIZACION\n")
-        f.write(f"   Fecha estimada de finalizacion : {proy.fecha_estimada_final}\n")
-        if proy.finalizado:
-            f.write(f"   Fecha real de finalizacion     : {proy.fecha_real_final}\n")
-        f.write("\n===========================================\n")
+        f.write("".join(partes))
     return ruta
 
 
@@ -391,10 +509,12 @@ def mover_a_finalizados(proy):
     """
     origen = os.path.join("Proyectos", f"{proy.pid}.txt")
     destino = os.path.join("ProyectosFinalizados", f"{proy.pid}.txt")
-    if os.path.exists(origen):
+    # os.replace solo renombra el archivo (no copia su contenido)
+    try:
         os.replace(origen, destino)
-        return destino
-    return None
+    except FileNotFoundError:
+        return None
+    return destino
 
 
 # ---------------------------------------------------------
@@ -405,22 +525,32 @@ def graficar_crecimiento_precio(proy):
     Grafica la proyeccion de crecimiento del precio de venta por m2
     asumiendo 5% anual usando matplotlib.
     """
+    # matplotlib y numpy se importan solo al graficar: son lentos de cargar
+    # y el resto del menu no los necesita
+    import matplotlib.pyplot as plt
+    import numpy as np
+
     print("Mostrando grafica de crecimiento del precio de venta por m2 (5% anual)...")
     anos = 10
-    xs = list(range(anos + 1))
+    moneda = moneda_actual
+    xs = np.arange(anos + 1)
     # Convertir precio_venta_m2 (COP) a moneda_actual
-    factor = TASA_DE_CONVERSION.get(moneda_actual, 1.0)
+    factor = TASA_DE_CONVERSION.get(moneda, 1.0)
     precio_inicial = proy.precio_venta_m2 * factor
-    ys = [precio_inicial * ((1 + 0.05) ** t) for t in xs]
-
-    plt.figure()
-    plt.plot(xs, ys, marker="o", label=f"Precio Venta m2 ({moneda_actual})")
-    plt.title(f"Crecimiento Precio Venta m2 - Proyecto {proy.pid}")
-    plt.xlabel("Anios")
-    plt.ylabel(f"Precio Venta m2 ({moneda_actual})")
-    plt.grid(True)
-    plt.legend()
-    plt.show()
+    ys = precio_inicial * np.power(1 + 0.05, xs)
+
+    # Simplificar el trazo de la linea para enviar menos vertices al backend
+    with plt.rc_context({"path.simplify": True, "path.simplify_threshold": 1.0}):
+        fig, ax = plt.subplots()
+        ax.plot(xs, ys, marker="o", label=f"Precio Venta m2 ({moneda})")
+        ax.set_title(f"Crecimiento Precio Venta m2 - Proyecto {proy.pid}")
+        ax.set_xlabel("Anios")
+        ax.set_ylabel(f"Precio Venta m2 ({moneda})")
+        ax.grid(True)
+        ax.legend()
+        plt.show()
+    # Cerrar la figura para que no se acumulen en el registro de pyplot
+    plt.close(fig)
 
 
 def graficar_balance(proy):
@@ -428,23 +558,41 @@ def graficar_balance(proy):
     Grafica un bar chart comparando inversion (terreno+construccion)
     vs ganancia (20%) en la moneda actual.
     """
+    import matplotlib.pyplot as plt
+
     factor = TASA_DE_CONVERSION.get(moneda_actual, 1.0)
     presupuesto = proy.presupuesto_total * factor
     ganancia = proy.ganancia * factor
 
-    print(f"Inversion (terreno + construccion): {SIMBOLO_MONEDA[moneda_actual]} {presupuesto:,.2f} {moneda_actual}")
-    print(f"Ganancia estimada (20%):            {SIMBOLO_MONEDA[moneda_actual]} {ganancia:,.2f} {moneda_actual}")
+    print(f"Inversion (terreno + construccion): {formatear_valor(proy.presupuesto_total)}")
+    print(f"Ganancia estimada (20%):            {formatear_valor(proy.ganancia)}")
 
-    plt.figure()
-    plt.bar(["Inversion", "Ganancia"], [presupuesto, ganancia])
-    plt.title(f"Balance Proyecto {proy.pid} ({moneda_actual})")
-    plt.ylabel(moneda_actual)
+    fig, ax = plt.subplots()
+    ax.bar(["Inversion", "Ganancia"], [presupuesto, ganancia])
+    ax.set_title(f"Balance Proyecto {proy.pid} ({moneda_actual})")
+    ax.set_ylabel(moneda_actual)
     plt.show()
+    plt.close(fig)
 
 
 # ---------------------------------------------------------
 #  FUNCIONES PARA LEER DATOS DESDE CONSOLA
 # ---------------------------------------------------------
+def _parsear_fecha(s):
+    """
+    Convierte un texto YYYY-MM-DD en date. Si el texto tiene exactamente esa
+    forma usa date.fromisoformat (mucho mas rapido); si no, strptime, que
+    tambien acepta fechas sin ceros como 2024-1-5. fromisoformat no se usa
+    con otros textos porque aceptaria formatos como 20240105 o 2024-W01-1.
+    """
+    if len(s) == 10 and s[4] == s[7] == "-":
+        try:
+            return datetime.date.fromisoformat(s)
+        except ValueError:
+            pass
+    return datetime.datetime.strptime(s, "%Y-%m-%d").date()
+
+
 def leer_fecha(prompt, fecha_inicio=None):
     """
     Lee una fecha con formato YYYY-MM-DD. Si se pasa fecha_inicio,
@@ -455,7 +603,7 @@ def leer_fecha(prompt, fecha_inicio=None):
         if not s:
             return None
         try:
-            fecha = datetime.datetime.strptime(s, "%Y-%m-%d").date()
+            fecha = _parsear_fecha(s)
             if fecha_inicio and fecha < fecha_inicio:
                 print("  La fecha de finalizacion no puede ser anterior a la fecha de inicio.")
                 r = input("  Reintentar? (s/n): ").strip().lower()
@@ -463,7 +611,7 @@ def leer_fecha(prompt, fecha_inicio=None):
                     return None
                 continue
             return fecha
-        except:
+        except ValueError:
             print("  Fecha invalida. Use formato YYYY-MM-DD.")
             r = input("  Reintentar? (s/n): ").strip().lower()
             if r != "s":
@@ -513,14 +661,317 @@ def leer_int(prompt, minimo=None, maximo=None):
                 return None
 
 
+# ---------------------------------------------------------
+#  OPERACIONES SOBRE PROYECTOS (sin leer ni imprimir en consola)
+# ---------------------------------------------------------
+def guardar_proyecto(bd, proy):
+    """
+    Guarda el proyecto en la base de datos y genera su recibo.
+    Retorna la ruta del recibo.
+    """
+    bd.agregar(proy)
+    return generar_recibo(proy)
+
+
+def modificar_proyecto(bd, proy, precio_terreno_m2=None, tamano=None, habitaciones=None, estrato=None):
+    """
+    Aplica los cambios indicados (None mantiene el valor actual), recalcula
+    solo lo necesario, regenera el recibo y guarda el proyecto.
+    Retorna la ruta del recibo.
+    """
+    # Precio, tamano y estrato cambian los costos (y con ellos las
+    # unidades); las habitaciones solo cambian las unidades
+    cambio_costos = False
+    cambio_unidades = False
+
+    if precio_terreno_m2 is not None:
+        proy.precio_terreno_m2 = precio_terreno_m2
+        cambio_costos = True
+
+    if tamano is not None:
+        proy.tamano = tamano
+        proy.porc_construccion = PORC_CONSTRUCCION_POR_TAMANO.get(tamano, 45.0)
+        cambio_costos = True
+
+    if habitaciones is not None:
+        proy.habitaciones = habitaciones
+        cambio_unidades = True
+
+    if estrato is not None:
+        proy.estrato = estrato
+        # Actualizar zonas sociales si cambia estrato
+        proy.zonas_sociales = ZONAS_SOCIALES_POR_ESTRATO[estrato]
+        cambio_costos = True
+
+    # Recalcular solo lo que depende de los datos modificados
+    if cambio_costos:
+        proy._recalcular()
+    elif cambio_unidades:
+        proy._recalcular_unidades()
+
+    ruta = generar_recibo(proy)
+    bd.agregar(proy)
+    return ruta
+
+
+def borrar_proyecto(bd, pid):
+    """
+    Elimina el proyecto de la base de datos junto con su recibo.
+    """
+    bd.eliminar(pid)
+    txt = os.path.join("Proyectos", f"{pid}.txt")
+    if os.path.exists(txt):
+        os.remove(txt)
+
+
+def finalizar_proyecto(bd, proy, fecha_real):
+    """
+    Marca el proyecto como finalizado, mueve su recibo a
+    'ProyectosFinalizados' y lo saca de la base de datos.
+    """
+    proy.finalizado = True
+    proy.fecha_real_final = fecha_real
+    mover_a_finalizados(proy)
+    bd.eliminar(proy.pid)
+
+
+def cambiar_moneda(moneda):
+    """
+    Cambia la moneda en que se muestran los valores.
+    Retorna False si la moneda no es valida.
+    """
+    global moneda_actual
+    if moneda not in TASA_DE_CONVERSION:
+        return False
+    moneda_actual = moneda
+    _formatear_en_moneda.cache_clear()
+    return True
+
+
+# Campos de cada comando de ejecutar_comandos: (obligatorios, opcionales)
+_CAMPOS_COMANDO = {
+    "registrar": (("pid", "tipo", "fecha_inicio", "direccion", "area_lote", "precio_terreno_m2",
+                   "tamano", "estrato", "habitaciones", "fecha_estimada_final"), ()),
+    "modificar": (("pid",), ("precio_terreno_m2", "tamano", "habitaciones", "estrato")),
+    "borrar": (("pid",), ()),
+    "finalizar": (("pid", "fecha_real"), ()),
+    "moneda": (("moneda",), ())
+}
+
+
+def _validar_fecha(nombre, fecha, fecha_inicio=None):
+    """
+    Lanza ValueError si fecha no es una fecha (date) o si es anterior a
+    fecha_inicio, como hace leer_fecha en el menu.
+    """
+    if type(fecha) is not datetime.date:
+        raise ValueError(f"{nombre} debe ser una fecha (datetime.date): {fecha!r}")
+    if fecha_inicio is not None and fecha < fecha_inicio:
+        raise ValueError(f"{nombre} no puede ser anterior a la fecha de inicio ({fecha_inicio}).")
+
+
+def _validar_entero(nombre, valor, minimo, maximo=None):
+    """
+    Lanza ValueError si valor no es un entero entre minimo y maximo
+    (sin maximo si es None), como hace leer_int en el menu.
+    """
+    if (isinstance(valor, bool) or not isinstance(valor, int) or valor < minimo
+            or (maximo is not None and valor > maximo)):
+        rango = f"{minimo}-{maximo}" if maximo is not None else f">= {minimo}"
+        raise ValueError(f"{nombre} debe ser un entero {rango}: {valor!r}")
+
+
+def _validar_datos_proyecto(datos, maximo_habitaciones=5):
+    """
+    Valida los datos de un proyecto que trae un comando con las mismas
+    reglas que el menu interactivo. Solo revisa los campos presentes en
+    datos. Lanza ValueError con el primer dato invalido.
+    """
+    if "pid" in datos and (not isinstance(datos["pid"], str) or not datos["pid"].strip()):
+        raise ValueError("El ID no puede estar vacio.")
+    if "tipo" in datos and datos["tipo"] not in ("casas", "edificio"):
+        raise ValueError(f"Tipo de proyecto invalido (casas/edificio): {datos['tipo']!r}")
+    if "direccion" in datos and (not isinstance(datos["direccion"], str) or not datos["direccion"].strip()):
+        raise ValueError("La direccion no puede estar vacia.")
+    for nombre in ("area_lote", "precio_terreno_m2"):
+        if nombre in datos and (isinstance(datos[nombre], bool) or not isinstance(datos[nombre], (int, float))):
+            raise ValueError(f"{nombre} debe ser un numero: {datos[nombre]!r}")
+    if "tamano" in datos and datos["tamano"] not in ("grande", "mediana", "chica"):
+        raise ValueError(f"Tamano invalido (grande/mediana/chica): {datos['tamano']!r}")
+    if "estrato" in datos:
+        _validar_entero("estrato", datos["estrato"], 1, 6)
+    if "habitaciones" in datos:
+        _validar_entero("habitaciones", datos["habitaciones"], 1, maximo_habitaciones)
+    if "fecha_inicio" in datos:
+        _validar_fecha("fecha_inicio", datos["fecha_inicio"])
+    if "fecha_estimada_final" in datos:
+        _validar_fecha("fecha_estimada_final", datos["fecha_estimada_final"], datos.get("fecha_inicio"))
+
+
+def ejecutar_comandos(bd, comandos):
+    """
+    Ejecuta una secuencia de comandos (operacion, datos) sin pedir datos
+    ni imprimir nada, por ejemplo para migraciones o pruebas. Operaciones:
+      "registrar": datos = argumentos de Proyecto
+      "modificar": datos = {"pid": ..., y los campos a cambiar}
+      "borrar"   : datos = {"pid": ...}
+      "finalizar": datos = {"pid": ..., "fecha_real": fecha}
+      "moneda"   : datos = {"moneda": "COP", "USD" o "EUR"}
+    Aplica las mismas validaciones que el menu interactivo y lanza
+    ValueError si un comando no es valido (operacion o campo desconocido,
+    campo faltante, dato fuera de rango, ID repetido o inexistente). Para
+    "modificar" un valor None mantiene el dato actual. Ejemplo:
+
+        hoy = datetime.date(2024, 1, 15)
+        menu_principal(comandos=[
+            ("registrar", {"pid": "p1", "tipo": "casas", "fecha_inicio": hoy,
+                           "direccion": "Calle 5 # 10-20", "area_lote": 1200.0,
+                           "precio_terreno_m2": 350000.0, "tamano": "mediana",
+                           "estrato": 4, "habitaciones": 3,
+                           "fecha_estimada_final": datetime.date(2025, 6, 30)}),
+            ("modificar", {"pid": "p1", "precio_terreno_m2": 400000.0}),
+            ("finalizar", {"pid": "p1", "fecha_real": datetime.date(2025, 7, 1)}),
+        ])
+    """
+    for operacion, datos in comandos:
+        datos = dict(datos)
+        if operacion not in _CAMPOS_COMANDO:
+            raise ValueError(f"Operacion desconocida: {operacion}")
+        obligatorios, opcionales = _CAMPOS_COMANDO[operacion]
+        faltantes = [c for c in obligatorios if c not in datos]
+        if faltantes:
+            raise ValueError(f"Faltan campos en '{operacion}': {', '.join(faltantes)}")
+        desconocidos = [c for c in datos if c not in obligatorios and c not in opcionales]
+        if desconocidos:
+            raise ValueError(f"Campos desconocidos en '{operacion}': {', '.join(map(str, desconocidos))}")
+
+        if operacion == "registrar":
+            _validar_datos_proyecto(datos)
+            if datos["pid"] in bd:
+                raise ValueError(f"Ya existe un proyecto con ese ID: {datos['pid']}")
+            guardar_proyecto(bd, Proyecto(**datos))
+        elif operacion == "moneda":
+            if not isinstance(datos["moneda"], str) or not cambiar_moneda(datos["moneda"]):
+                raise ValueError(f"Moneda invalida: {datos['moneda']}")
+        else:
+            pid = datos.pop("pid")
+            if not isinstance(pid, str) or pid not in bd:
+                raise ValueError(f"Proyecto no encontrado: {pid}")
+            if operacion == "borrar":
+                borrar_proyecto(bd, pid)
+                continue
+            p = bd.obtener(pid)
+            if operacion == "modificar":
+                # Como en menu_opciones, las habitaciones no tienen maximo al modificar
+                _validar_datos_proyecto({c: v for c, v in datos.items() if v is not None},
+                                        maximo_habitaciones=None)
+                modificar_proyecto(bd, p, **datos)
+            else:
+                _validar_fecha("fecha_real", datos["fecha_real"], p.fecha_inicio)
+                finalizar_proyecto(bd, p, datos["fecha_real"])
+
+
 # ---------------------------------------------------------
 #  MENUS Y FLUJO PRINCIPAL
 # ---------------------------------------------------------
+# Plantillas de la consulta de un proyecto (opcion 2 del menu principal).
+# Se arman una sola vez; en cada consulta solo se rellenan los valores.
+_CONSULTA_INICIO = (
+    "\n--- Datos del Proyecto ---\n"
+    "ID                               : {pid}\n"
+    "Tipo de proyecto                 : {tipo}\n"
+    "Fecha de inicio                  : {fecha_inicio}\n"
+    "Direccion                        : {direccion}\n\n"
+    "2. AREAS Y TERRENO\n"
+    "   Area total del lote           : {area_lote} m2\n"
+    "   Precio terreno por m2         : {precio_terreno_m2} /m2\n"
+    "   Costo terreno total           : {costo_terreno_total}\n"
+    "   % Area construida             : {porc_construccion} %\n"
+    "   Area construida               : {area_construida} m2\n"
+    "   Area no construida            : {area_no_construida} m2\n\n"
+    "3. RESTRICCIONES Y VIVIENDAS\n"
+)
+_CONSULTA_TORRES = (
+    "   Numero de torres              : {num_torres}\n"
+    "   Aptos por torre               : {aptos_por_torre}\n"
+)
+_CONSULTA_FIN = (
+    "   Habitaciones por unidad       : {habitaciones}\n"
+    "   Area minima por unidad        : {area_min_vivienda} m2\n"
+    "   Numero de unidades estimado   : {num_viviendas}\n"
+    "   Valor por unidad              : {valor_casa}\n\n"
+    "4. COSTOS Y GANANCIAS\n"
+    "   Costo construccion por m2          : {costo_construccion_m2} /m2\n"
+    "   Costo construccion total           : {costo_construccion_total}\n"
+    "   Presupuesto total                  : {presupuesto_total}\n"
+    "   Ganancia (20%)                     : {ganancia}\n"
+    "   Precio venta por m2 (derivado)     : {precio_venta_m2} /m2\n"
+    "   Precio venta total                 : {precio_venta_total}\n\n"
+    "{linea_derivada}"
+    "5. ZONAS SOCIALES\n"
+    "   {zonas_sociales}\n\n"
+    "6. FECHAS DE FINALIZACION\n"
+    "   Fecha estimada de finalizacion    : {fecha_estimada_final}\n"
+    "{linea_fecha_real}"
+)
+_PLANTILLA_CONSULTA_EDIFICIO = _CONSULTA_INICIO + _CONSULTA_TORRES + _CONSULTA_FIN
+_PLANTILLA_CONSULTA_OTRO = _CONSULTA_INICIO + _CONSULTA_FIN
+
+# Formateadores numericos de la consulta, con la especificacion de formato
+# ya interpretada una sola vez
+_FORMATO_DECIMAL = "{:,.2f}".format
+_FORMATO_ENTERO = "{:,d}".format
+_FORMATO_PORCENTAJE = "{:.0f}".format
+
+
+def formatear_consulta(p):
+    """
+    Retorna el texto con todos los datos del proyecto p, con los valores
+    monetarios en la moneda actual.
+    """
+    derivada = p.calcular_derivada_valor_por_vivienda()
+    datos = {
+        "pid": p.pid,
+        "tipo": p.tipo.capitalize(),
+        "fecha_inicio": p.fecha_inicio,
+        "direccion": p.direccion,
+        "area_lote": _FORMATO_DECIMAL(p.area_lote),
+        "precio_terreno_m2": formatear_valor(p.precio_terreno_m2),
+        "costo_terreno_total": formatear_valor(p.costo_terreno_total),
+        "porc_construccion": _FORMATO_PORCENTAJE(p.porc_construccion),
+        "area_construida": _FORMATO_DECIMAL(p.area_construida),
+        "area_no_construida": _FORMATO_DECIMAL(p.area_no_construida),
+        "habitaciones": p.habitaciones,
+        "area_min_vivienda": _FORMATO_DECIMAL(p.area_min_vivienda),
+        "num_viviendas": _FORMATO_ENTERO(p.num_viviendas),
+        "valor_casa": formatear_valor(p.valor_casa),
+        "costo_construccion_m2": formatear_valor(p.costo_construccion_m2),
+        "costo_construccion_total": formatear_valor(p.costo_construccion_total),
+        "presupuesto_total": formatear_valor(p.presupuesto_total),
+        "ganancia": formatear_valor(p.ganancia),
+        "precio_venta_m2": formatear_valor(p.precio_venta_m2),
+        "precio_venta_total": formatear_valor(p.precio_venta_total),
+        "linea_derivada": "",
+        "zonas_sociales": p.zonas_joined,
+        "fecha_estimada_final": p.fecha_estimada_final,
+        "linea_fecha_real": ""
+    }
+    if derivada is not None:
+        datos["linea_derivada"] = f"   Derivada valor por unidad respecto num unidades: {_FORMATO_DECIMAL(derivada)}\n\n"
+    if p.finalizado:
+        datos["linea_fecha_real"] = f"   Fecha real de finalizacion         : {p.fecha_real_final}\n"
+
+    if p.tipo == "edificio":
+        datos["num_torres"] = p.num_torres
+        datos["aptos_por_torre"] = p.aptos_por_torre
+        return _PLANTILLA_CONSULTA_EDIFICIO.format_map(datos)
+    return _PLANTILLA_CONSULTA_OTRO.format_map(datos)
+
+
 def menu_opciones(bd):
     """
     Menu para modificar o borrar proyectos, o cambiar moneda.
     """
-    global moneda_actual
     while True:
         print("\n=== OPCIONES ===")
         print("1. Modificar datos de un proyecto")
@@ -538,55 +989,25 @@ def menu_opciones(bd):
 
             print("  Para modificar, ingrese nuevos valores o deje vacio para mantener.")
             nuev_precio = leer_float("  Nuevo precio terreno por m2 (COP): ")
-            if nuev_precio is not None:
-                p.precio_terreno_m2 = nuev_precio
 
             nueva_tamano = input("  Nuevo tamano (grande/mediana/chica): ").strip().lower()
-            if nueva_tamano in ["grande", "mediana", "chica"]:
-                p.tamano = nueva_tamano
-                if nueva_tamano == "grande":
-                    p.porc_construccion = 80.0
-                elif nueva_tamano == "mediana":
-                    p.porc_construccion = 60.0
-                else:
-                    p.porc_construccion = 45.0
+            if nueva_tamano not in ["grande", "mediana", "chica"]:
+                nueva_tamano = None
 
             nueva_habit = leer_int("  Nueva cantidad de habitaciones: ", 1)
-            if nueva_habit is not None:
-                p.habitaciones = nueva_habit
-
             nuevo_estrato = leer_int("  Nuevo estrato (1-6): ", 1, 6)
-            if nuevo_estrato is not None:
-                p.estrato = nuevo_estrato
-                # Actualizar zonas sociales si cambia estrato
-                if p.estrato >= 5:
-                    p.zonas_sociales = ["Piscina", "Sauna", "Gimnasio"]
-                elif p.estrato == 4:
-                    p.zonas_sociales = ["Piscina", "Salon comun"]
-                elif p.estrato == 3:
-                    p.zonas_sociales = ["Parque infantil", "Salon comun"]
-                else:
-                    p.zonas_sociales = ["Zonas verdes", "Parque infantil"]
-
-            # Recalcular todo despues de cambios
-            p._recalcular()
-
-            ruta = generar_recibo(p)
-            bd.agregar(p)
+
+            ruta = modificar_proyecto(bd, p, nuev_precio, nueva_tamano, nueva_habit, nuevo_estrato)
             print(f"  Proyecto modificado y recibo regenerado en: {ruta}")
 
         elif op == "2":
             pid = input("ID del proyecto a borrar: ").strip()
-            p = bd.obtener(pid)
-            if not p:
+            if pid not in bd:
                 print("  Proyecto no encontrado.")
                 continue
             r = input("  Desea borrar este proyecto? (s/n): ").strip().lower()
             if r == "s":
-                bd.eliminar(pid)
-                txt = os.path.join("Proyectos", f"{pid}.txt")
-                if os.path.exists(txt):
-                    os.remove(txt)
+                borrar_proyecto(bd, pid)
                 print("  Proyecto borrado.")
             else:
                 print("  Operacion cancelada.")
@@ -594,8 +1015,7 @@ def menu_opciones(bd):
         elif op == "3":
             print(f"  Moneda actual: {moneda_actual}")
             nueva = input("  Ingrese nueva moneda (COP, USD, EUR): ").strip().upper()
-            if nueva in ["COP", "USD", "EUR"]:
-                moneda_actual = nueva
+            if cambiar_moneda(nueva):
                 print(f"  Moneda cambiada a {moneda_actual}.")
             else:
                 print("  Moneda invalida.")
@@ -607,261 +1027,258 @@ def menu_opciones(bd):
             print("  Opcion no valida.")
 
 
-def menu_principal():
-    crear_carpetas()
-    bd = BaseDeDatos()
-
-    while True:
-        print("\n=== MENU PRINCIPAL ===")
-        print("1. Registrar Proyecto")
-        print("2. Consultar Proyecto")
-        print("3. Crecimiento Precio")
-        print("4. Balance Proyecto")
-        print("5. Finalizar Proyecto")
-        print("6. Opciones")
-        print("7. Salir")
-        op = input("Opcion: ").strip()
-
-        if op == "1":
-            # Registrar proyecto nuevo
-            pid = input("ID unico del proyecto (sin espacios): ").strip()
-            if not pid:
-                print("  El ID no puede estar vacio.")
-                continue
-            if bd.obtener(pid):
-                print("  Ya existe un proyecto con ese ID.")
-                continue
-
-            tipo = ""
-            while tipo not in ["casas", "edificio"]:
-                tipo = input("Tipo de proyecto (casas/edificio): ").strip().lower()
-                if tipo not in ["casas", "edificio"]:
-                    print("  Opcion invalida.")
-
-            fecha_inicio = leer_fecha("Fecha de inicio (YYYY-MM-DD): ")
-            if fecha_inicio is None:
-                print("  Fecha de inicio requerida.")
-                continue
-
-            direccion = input("Direccion del proyecto: ").strip()
-            if not direccion:
-                print("  La direccion no puede estar vacia.")
-                continue
+def _op_registrar(bd):
+    """
+    Opcion 1: registra un proyecto nuevo pidiendo sus datos por consola.
+    """
+    pid = input("ID unico del proyecto (sin espacios): ").strip()
+    if not pid:
+        print("  El ID no puede estar vacio.")
+        return
+    if pid in bd:
+        print("  Ya existe un proyecto con ese ID.")
+        return
+
+    tipo = ""
+    while tipo not in ["casas", "edificio"]:
+        tipo = input("Tipo de proyecto (casas/edificio): ").strip().lower()
+        if tipo not in ["casas", "edificio"]:
+            print("  Opcion invalida.")
+
+    fecha_inicio = leer_fecha("Fecha de inicio (YYYY-MM-DD): ")
+    if fecha_inicio is None:
+        print("  Fecha de inicio requerida.")
+        return
+
+    direccion = input("Direccion del proyecto: ").strip()
+    if not direccion:
+        print("  La direccion no puede estar vacia.")
+        return
+
+    area_lote = leer_float("Area total del lote (m2): ")
+    if area_lote is None:
+        return
+
+    precio_terreno_m2 = leer_float("Precio terreno por m2 (COP): ")
+    if precio_terreno_m2 is None:
+        return
+
+    # Tamano de construccion
+    tamano = ""
+    while tamano not in ["grande", "mediana", "chica"]:
+        tamano = input("Tamano de construccion (grande/mediana/chica): ").strip().lower()
+        if tamano not in ["grande", "mediana", "chica"]:
+            print("  Opcion invalida.")
+
+    estrato = leer_int("Estrato (1-6): ", 1, 6)
+    if estrato is None:
+        return
+
+    # Para casas y edificio pido habitaciones
+    habitaciones = None
+    if tipo in ["casas", "edificio"]:
+        habitaciones = leer_int("Cantidad de habitaciones por unidad (1-5 recomendado): ", 1, 5)
+        if habitaciones is None:
+            return
+
+    fecha_estimada = leer_fecha("Fecha estimada de finalizacion (YYYY-MM-DD): ", fecha_inicio)
+    if fecha_estimada is None:
+        return
+
+    # Crear el proyecto y calcular todo internamente
+    p = Proyecto(
+        pid=pid,
+        tipo=tipo,
+        fecha_inicio=fecha_inicio,
+        direccion=direccion,
+        area_lote=area_lote,
+        precio_terreno_m2=precio_terreno_m2,
+        tamano=tamano,
+        estrato=estrato,
+        habitaciones=habitaciones,
+        fecha_estimada_final=fecha_estimada
+    )
+
+    # Mostrar resumen del proyecto ingresado
+    print("\n--- Resumen del proyecto ingresado ---")
+    print(f"ID                               : {p.pid}")
+    print(f"Tipo de proyecto                 : {p.tipo.capitalize()}")
+    print(f"Fecha de inicio                  : {p.fecha_inicio}")
+    print(f"Direccion                        : {p.direccion}\n")
+
+    print("2. AREAS Y TERRENO")
+    print(f"   Area total del lote           : {p.area_lote:,.2f} m2")
+    print(f"   Precio terreno por m2         : {formatear_valor(p.precio_terreno_m2)} /m2")
+    print(f"   Costo terreno total           : {formatear_valor(p.costo_terreno_total)}")
+    print(f"   % Area construida             : {p.porc_construccion:.0f} %")
+    print(f"   Area construida               : {p.area_construida:,.2f} m2")
+    print(f"   Area no construida            : {p.area_no_construida:,.2f} m2\n")
+
+    print("3. RESTRICCIONES Y VIVIENDAS")
+    if p.tipo == "edificio":
+        print(f"   Numero de torres              : {p.num_torres}")
+        print(f"   Aptos por torre               : {p.aptos_por_torre}")
+    print(f"   Habitaciones por unidad       : {p.habitaciones}")
+    print(f"   Area minima por unidad        : {p.area_min_vivienda:,.2f} m2")
+    print(f"   Numero de unidades estimado   : {p.num_viviendas:,d}")
+    print(f"   Valor por unidad              : {formatear_valor(p.valor_casa)}\n")
+
+    print("4. COSTOS Y GANANCIAS")
+    print(f"   Costo construccion por m2          : {formatear_valor(p.costo_construccion_m2)} /m2")
+    print(f"   Costo construccion total           : {formatear_valor(p.costo_construccion_total)}")
+    print(f"   Presupuesto (terreno+construccion) : {formatear_valor(p.presupuesto_total)}")
+    print(f"   Ganancia (20%)                     : {formatear_valor(p.ganancia)}")
+    print(f"   Precio venta por m2 (derivado)     : {formatear_valor(p.precio_venta_m2)} /m2")
+    print(f"   Precio venta total                 : {formatear_valor(p.precio_venta_total)}\n")
+
+    if p.tipo in ["casas", "edificio"]:
+        derivada = p.calcular_derivada_valor_por_vivienda()
+        if derivada is not None:
+            print(f"   Derivada valor por unidad respecto num unidades: {derivada:,.2f}\n")
+
+    print("5. ZONAS SOCIALES")
+    print(f"   {p.zonas_joined}\n")
+
+    print("6. FECHAS DE FINALIZACION")
+    print(f"   Fecha estimada de finalizacion    : {p.fecha_estimada_final}")
+    print("   (La fecha real se asigna al finalizar)\n")
+
+    guardar = input("¿Guardar este proyecto? (s/n): ").strip().lower()
+    if guardar == "s":
+        ruta_recibo = guardar_proyecto(bd, p)
+        print(f"  Proyecto guardado. Recibo en: {ruta_recibo}")
+    else:
+        print("  Proyecto descartado.")
+
+
+def _op_consultar(bd):
+    """
+    Opcion 2: muestra todos los datos de un proyecto existente.
+    """
+    if not bd:
+        print("  No hay proyectos registrados.")
+        return
 
-            area_lote = leer_float("Area total del lote (m2): ")
-            if area_lote is None:
-                continue
+    pid = input("ID del proyecto a consultar: ").strip()
+    p = bd.obtener(pid)
+    if not p:
+        print("  Proyecto no encontrado.")
+        return
 
-            precio_terreno_m2 = leer_float("Precio terreno por m2 (COP): ")
-            if precio_terreno_m2 is None:
-                continue
+    # Mostrar datos del proyecto (se imprime todo de una sola vez)
+    sys.stdout.write(formatear_consulta(p))
 
-            # Tamano de construccion
-            tamano = ""
-            while tamano not in ["grande", "mediana", "chica"]:
-                tamano = input("Tamano de construccion (grande/mediana/chica): ").strip().lower()
-                if tamano not in ["grande", "mediana", "chica"]:
-                    print("  Opcion invalida.")
 
-            estrato = leer_int("Estrato (1-6): ", 1, 6)
-            if estrato is None:
-                continue
+def _op_graficar_precio(bd):
+    """
+    Opcion 3: grafica el crecimiento del precio de venta por m2.
+    """
+    if not bd:
+        print("  No hay proyectos registrados.")
+        return
 
-            # Para casas y edificio pido habitaciones
-            habitaciones = None
-            if tipo in ["casas", "edificio"]:
-                habitaciones = leer_int("Cantidad de habitaciones por unidad (1-5 recomendado): ", 1, 5)
-                if habitaciones is None:
-                    continue
+    pid = input("ID del proyecto para graficar crecimiento precio: ").strip()
+    p = bd.obtener(pid)
+    if not p:
+        print("  Proyecto no encontrado.")
+        return
+    graficar_crecimiento_precio(p)
 
-            fecha_estimada = leer_fecha("Fecha estimada de finalizacion (YYYY-MM-DD): ", fecha_inicio)
-            if fecha_estimada is None:
-                continue
 
-            # Crear el proyecto y calcular todo internamente
-            p = Proyecto(
-                pid=pid,
-                tipo=tipo,
-                fecha_inicio=fecha_inicio,
-                direccion=direccion,
-                area_lote=area_lote,
-                precio_terreno_m2=precio_terreno_m2,
-                tamano=tamano,
-                estrato=estrato,
-                habitaciones=habitaciones,
-                fecha_estimada_final=fecha_estimada
-            )
+def _op_graficar_balance(bd):
+    """
+    Opcion 4: grafica el balance inversion vs ganancia.
+    """
+    if not bd:
+        print("  No hay proyectos registrados.")
+        return
 
-            # Mostrar resumen del proyecto ingresado
-            print("\n--- Resumen del proyecto ingresado ---")
-            print(f"ID                               : {p.pid}")
-            print(f"Tipo de proyecto                 : {p.tipo.capitalize()}")
-            print(f"Fecha de inicio                  : {p.fecha_inicio}")
-            print(f"Direccion                        : {p.direccion}\n")
-
-            print("2. AREAS Y TERRENO")
-            print(f"   Area total del lote           : {p.area_lote:,.2f} m2")
-            print(f"   Precio terreno por m2         : {formatear_valor(p.precio_terreno_m2)} /m2")
-            print(f"   Costo terreno total           : {formatear_valor(p.costo_terreno_total)}")
-            print(f"   % Area construida             : {p.porc_construccion:.0f} %")
-            print(f"   Area construida               : {p.area_construida:,.2f} m2")
-            print(f"   Area no construida            : {p.area_no_construida:,.2f} m2\n")
-
-            print("3. RESTRICCIONES Y VIVIENDAS")
-            if p.tipo == "edificio":
-                print(f"   Numero de torres              : {p.num_torres}")
-                print(f"   Aptos por torre               : {p.aptos_por_torre}")
-            print(f"   Habitaciones por unidad       : {p.habitaciones}")
-            print(f"   Area minima por unidad        : {p.area_min_vivienda:,.2f} m2")
-            print(f"   Numero de unidades estimado   : {p.num_viviendas:,d}")
-            print(f"   Valor por unidad              : {formatear_valor(p.valor_casa)}\n")
-
-            print("4. COSTOS Y GANANCIAS")
-            print(f"   Costo construccion por m2          : {formatear_valor(p.costo_construccion_m2)} /m2")
-            print(f"   Costo construccion total           : {formatear_valor(p.costo_construccion_total)}")
-            print(f"   Presupuesto (terreno+construccion) : {formatear_valor(p.presupuesto_total)}")
-            print(f"   Ganancia (20%)                     : {formatear_valor(p.ganancia)}")
-            print(f"   Precio venta por m2 (derivado)     : {formatear_valor(p.precio_venta_m2)} /m2")
-            print(f"   Precio venta total                 : {formatear_valor(p.precio_venta_total)}\n")
-
-            if p.tipo in ["casas", "edificio"]:
-                derivada = p.calcular_derivada_valor_por_vivienda()
-                if derivada is not None:
-                    print(f"   Derivada valor por unidad respecto num unidades: {derivada:,.2f}\n")
-
-            print("5. ZONAS SOCIALES")
-            print(f"   {', '.join(p.zonas_sociales)}\n")
-
-            print("6. FECHAS DE FINALIZACION")
-            print(f"   Fecha estimada de finalizacion    : {p.fecha_estimada_final}")
-            print("   (La fecha real se asigna al finalizar)\n")
-
-            guardar = input("¿Guardar este proyecto? (s/n): ").strip().lower()
-            if guardar == "s":
-                bd.agregar(p)
-                ruta_recibo = generar_recibo(p)
-                print(f"  Proyecto guardado. Recibo en: {ruta_recibo}")
-            else:
-                print("  Proyecto descartado.")
+    pid = input("ID del proyecto para graficar balance: ").strip()
+    p = bd.obtener(pid)
+    if not p:
+        print("  Proyecto no encontrado.")
+        return
+    graficar_balance(p)
 
-        elif op == "2":
-            # Consultar proyecto existente
-            proyectos = bd.listar()
-            if not proyectos:
-                print("  No hay proyectos registrados.")
-                continue
 
-            pid = input("ID del proyecto a consultar: ").strip()
-            p = bd.obtener(pid)
-            if not p:
-                print("  Proyecto no encontrado.")
-                continue
+def _op_finalizar(bd):
+    """
+    Opcion 5: finaliza un proyecto con su fecha real de finalizacion.
+    """
+    if not bd:
+        print("  No hay proyectos registrados.")
+        return
 
-            # Mostrar datos del proyecto
-            print("\n--- Datos del Proyecto ---")
-            print(f"ID                               : {p.pid}")
-            print(f"Tipo de proyecto                 : {p.tipo.capitalize()}")
-            print(f"Fecha de inicio                  : {p.fecha_inicio}")
-            print(f"Direccion                        : {p.direccion}\n")
-
-            print("2. AREAS Y TERRENO")
-            print(f"   Area total del lote           : {p.area_lote:,.2f} m2")
-            print(f"   Precio terreno por m2         : {formatear_valor(p.precio_terreno_m2)} /m2")
-            print(f"   Costo terreno total           : {formatear_valor(p.costo_terreno_total)}")
-            print(f"   % Area construida             : {p.porc_construccion:.0f} %")
-            print(f"   Area construida               : {p.area_construida:,.2f} m2")
-            print(f"   Area no construida            : {p.area_no_construida:,.2f} m2\n")
-
-            print("3. RESTRICCIONES Y VIVIENDAS")
-            if p.tipo == "edificio":
-                print(f"   Numero de torres              : {p.num_torres}")
-                print(f"   Aptos por torre               : {p.aptos_por_torre}")
-            print(f"   Habitaciones por unidad       : {p.habitaciones}")
-            print(f"   Area minima por unidad        : {p.area_min_vivienda:,.2f} m2")
-            print(f"   Numero de unidades estimado   : {p.num_viviendas:,d}")
-            print(f"   Valor por unidad              : {formatear_valor(p.valor_casa)}\n")
-
-            print("4. COSTOS Y GANANCIAS")
-            print(f"   Costo construccion por m2          : {formatear_valor(p.costo_construccion_m2)} /m2")
-            print(f"   Costo construccion total           : {formatear_valor(p.costo_construccion_total)}")
-            print(f"   Presupuesto total                  : {formatear_valor(p.presupuesto_total)}")
-            print(f"   Ganancia (20%)                     : {formatear_valor(p.ganancia)}")
-            print(f"   Precio venta por m2 (derivado)     : {formatear_valor(p.precio_venta_m2)} /m2")
-            print(f"   Precio venta total                 : {formatear_valor(p.precio_venta_total)}\n")
-
-            if p.tipo in ["casas", "edificio"]:
-                derivada = p.calcular_derivada_valor_por_vivienda()
-                if derivada is not None:
-                    print(f"   Derivada valor por unidad respecto num unidades: {derivada:,.2f}\n")
-
-            print("5. ZONAS SOCIALES")
-            print(f"   {', '.join(p.zonas_sociales)}\n")
-
-            print("6. FECHAS DE FINALIZACION")
-            print(f"   Fecha estimada de finalizacion    : {p.fecha_estimada_final}")
-            if p.finalizado:
-                print(f"   Fecha real de finalizacion         : {p.fecha_real_final}")
+    pid = input("ID del proyecto a finalizar: ").strip()
+    p = bd.obtener(pid)
+    if not p:
+        print("  Proyecto no encontrado.")
+        return
 
-        elif op == "3":
-            # Grafica crecimiento precio
-            proyectos = bd.listar()
-            if not proyectos:
-                print("  No hay proyectos registrados.")
-                continue
+    fecha_real = leer_fecha("Fecha real de finalizacion (YYYY-MM-DD): ", p.fecha_inicio)
+    if fecha_real is None:
+        return
 
-            pid = input("ID del proyecto para graficar crecimiento precio: ").strip()
-            p = bd.obtener(pid)
-            if not p:
-                print("  Proyecto no encontrado.")
-                continue
-            graficar_crecimiento_precio(p)
+    finalizar_proyecto(bd, p, fecha_real)
+    print(f"  Proyecto {pid} finalizado.")
 
-        elif op == "4":
-            # Grafica balance proyecto
-            proyectos = bd.listar()
-            if not proyectos:
-                print("  No hay proyectos registrados.")
-                continue
 
-            pid = input("ID del proyecto para graficar balance: ").strip()
-            p = bd.obtener(pid)
-            if not p:
-                print("  Proyecto no encontrado.")
-                continue
-            graficar_balance(p)
+def _op_salir(bd):
+    """
+    Opcion 7: cierra la base de datos. Retorna True para terminar el menu.
+    """
+    print("Saliendo...")
+    bd.cerrar()
+    return True
 
-        elif op == "5":
-            # Finalizar proyecto
-            proyectos = bd.listar()
-            if not proyectos:
-                print("  No hay proyectos registrados.")
-                continue
 
-            pid = input("ID del proyecto a finalizar: ").strip()
-            p = bd.obtener(pid)
-            if not p:
-                print("  Proyecto no encontrado.")
-                continue
+def _op_invalida(bd):
+    """
+    Cualquier otra entrada del menu principal.
+    """
+    print("  Opcion no valida.")
+
+
+# Opciones del menu principal: una sola busqueda en el diccionario
+# en lugar de recorrer una cadena de if/elif en cada vuelta
+OPCIONES_MENU_PRINCIPAL = {
+    "1": _op_registrar,
+    "2": _op_consultar,
+    "3": _op_graficar_precio,
+    "4": _op_graficar_balance,
+    "5": _op_finalizar,
+    "6": menu_opciones,
+    "7": _op_salir
+}
 
-            fecha_real = leer_fecha("Fecha real de finalizacion (YYYY-MM-DD): ", p.fecha_inicio)
-            if fecha_real is None:
-                continue
 
-            p.finalizado = True
-            p.fecha_real_final = fecha_real
-            mover_a_finalizados(p)
-            bd.eliminar(pid)
-            print(f"  Proyecto {pid} finalizado.")
+def menu_principal(comandos=None):
+    """
+    Menu principal interactivo. Si se pasa comandos (ver ejecutar_comandos),
+    se ejecutan directamente sin mostrar el menu ni pedir datos.
+    """
+    crear_carpetas()
+    bd = BaseDeDatos()
+    if comandos is not None:
+        try:
+            ejecutar_comandos(bd, comandos)
+        finally:
+            bd.cerrar()
+        return
 
-        elif op == "6":
-            menu_opciones(bd)
+    while True:
+        print("\n=== MENU PRINCIPAL ===")
+        print("1. Registrar Proyecto")
+        print("2. Consultar Proyecto")
+        print("3. Crecimiento Precio")
+        print("4. Balance Proyecto")
+        print("5. Finalizar Proyecto")
+        print("6. Opciones")
+        print("7. Salir")
+        op = input("Opcion: ").strip()
 
-        elif op == "7":
-            print("Saliendo...")
+        if OPCIONES_MENU_PRINCIPAL.get(op, _op_invalida)(bd):
             break
 
-        else:
-            print("  Opcion no valida.")
-
 if __name__ == "__main__":
     menu_principal()